@@ -0,0 +1,318 @@
+import os
+import re
+import hashlib
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+
+
+# Columns stored per lecture, in addition to the (course, lecture_idx) key
+LECTURE_FIELDS = (
+    "audio_url",
+    "transcript_url",
+    "audio_path",
+    "wav_path",
+    "transcript_pdf_path",
+    "transcript_txt_path",
+    "duration",
+    "audio_checksum",
+    "transcript_checksum",
+    "text_length",
+)
+
+# Pipeline stages, in the order they are normally run
+STAGES = (
+    "download_audio",
+    "download_transcript",
+    "crop_audio",
+    "preprocess_transcript",
+    "dedup",
+    "manifest",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lectures (
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL,
+    audio_url TEXT,
+    transcript_url TEXT,
+    audio_path TEXT,
+    wav_path TEXT,
+    transcript_pdf_path TEXT,
+    transcript_txt_path TEXT,
+    duration REAL,
+    audio_checksum TEXT,
+    transcript_checksum TEXT,
+    text_length INTEGER,
+    PRIMARY KEY (course, lecture_idx)
+);
+CREATE INDEX IF NOT EXISTS idx_lectures_wav_path ON lectures (wav_path);
+CREATE INDEX IF NOT EXISTS idx_lectures_audio_url ON lectures (audio_url);
+
+CREATE TABLE IF NOT EXISTS stage_status (
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (course, lecture_idx, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_stage_status_stage ON stage_status (course, stage, status);
+"""
+
+
+def course_key_from_url(course_url):
+    """
+    Derive a course key from an NPTEL course URL.
+
+    Args:
+        course_url (str): URL of the NPTEL course (e.g. 'https://nptel.ac.in/courses/106106184').
+
+    Returns:
+        str: Last non-empty path segment of the URL (e.g. '106106184').
+    """
+    segments = [segment for segment in course_url.split("?")[0].split("/") if segment]
+    return segments[-1] if segments else course_url
+
+
+def lecture_index_from_filename(filename):
+    """
+    Extract the lecture index from a stage output file name.
+
+    Args:
+        filename (str): File name such as 'audio_3.wav' or 'transcript_3.txt'.
+
+    Returns:
+        int: Lecture index, or None if the file name does not carry one.
+    """
+    match = re.search(r'_(\d+)\.\w+$', os.path.basename(filename))
+    return int(match.group(1)) if match else None
+
+
+def file_checksum(filepath, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 checksum of a file.
+
+    Args:
+        filepath (str): Path to the file.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LectureCatalogue:
+    """
+    SQLite catalogue linking the audio, transcript and manifest entries of each
+    lecture across pipeline stages, keyed by (course, lecture index).
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the catalogue database.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def upsert_lecture(self, course, lecture_idx, **fields):
+        """
+        Insert a lecture or update the given fields of an existing one.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            **fields: Values for any of the columns in LECTURE_FIELDS.
+        """
+        unknown = set(fields) - set(LECTURE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown catalogue fields: {', '.join(sorted(unknown))}")
+
+        columns = ["course", "lecture_idx"] + list(fields)
+        placeholders = ", ".join("?" for _ in columns)
+        if fields:
+            updates = ", ".join(f"{column} = excluded.{column}" for column in fields)
+            conflict = f"DO UPDATE SET {updates}"
+        else:
+            conflict = "DO NOTHING"
+
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO lectures ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (course, lecture_idx) {conflict}",
+                [course, int(lecture_idx)] + list(fields.values()),
+            )
+
+    def set_stage_status(self, course, lecture_idx, stage, status):
+        """
+        Record the status of a pipeline stage for a lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            stage (str): One of STAGES.
+            status (str): Status such as 'done', 'failed' or 'skipped'.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO lectures (course, lecture_idx) VALUES (?, ?) "
+                "ON CONFLICT (course, lecture_idx) DO NOTHING",
+                (course, int(lecture_idx)),
+            )
+            self.conn.execute(
+                "INSERT INTO stage_status (course, lecture_idx, stage, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (course, lecture_idx, stage) "
+                "DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at",
+                (course, int(lecture_idx), stage, status, updated_at),
+            )
+
+    def get_lecture(self, course, lecture_idx):
+        """
+        Fetch a single lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+
+        Returns:
+            dict: Lecture row, or None if the lecture is not catalogued.
+        """
+        row = self.conn.execute(
+            "SELECT * FROM lectures WHERE course = ? AND lecture_idx = ?",
+            (course, int(lecture_idx)),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def find_by_wav_path(self, wav_path):
+        """
+        Look up the lecture that owns a WAV file.
+
+        Args:
+            wav_path (str): Path to the (cropped) 16 kHz WAV file.
+
+        Returns:
+            dict: Lecture row, or None if no lecture references the path.
+        """
+        row = self.conn.execute("SELECT * FROM lectures WHERE wav_path = ?", (wav_path,)).fetchone()
+        return dict(row) if row else None
+
+    def lectures(self, course=None, require=()):
+        """
+        List catalogued lectures, optionally restricted to a course and to
+        lectures whose given fields are all set.
+
+        Args:
+            course (str): Course key, or None for every course.
+            require (iterable): Names of fields in LECTURE_FIELDS that must be non-null.
+
+        Returns:
+            list: Lecture rows as dicts, ordered by course and lecture index.
+        """
+        unknown = set(require) - set(LECTURE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown catalogue fields: {', '.join(sorted(unknown))}")
+
+        conditions = [f"{field} IS NOT NULL" for field in require]
+        params = []
+        if course is not None:
+            conditions.append("course = ?")
+            params.append(course)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = self.conn.execute(
+            f"SELECT * FROM lectures {where} ORDER BY course, lecture_idx", params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stage_counts(self, course=None):
+        """
+        Count lectures per stage and status.
+
+        Args:
+            course (str): Course key, or None for every course.
+
+        Returns:
+            dict: Mapping of (stage, status) to the number of lectures.
+        """
+        where, params = ("WHERE course = ?", (course,)) if course is not None else ("", ())
+        rows = self.conn.execute(
+            f"SELECT stage, status, COUNT(*) AS n FROM stage_status {where} GROUP BY stage, status",
+            params,
+        ).fetchall()
+        return {(row["stage"], row["status"]): row["n"] for row in rows}
+
+    def summary(self, course=None):
+        """
+        Compute corpus statistics for lectures that have both audio and text.
+
+        Args:
+            course (str): Course key, or None for every course.
+
+        Returns:
+            dict: Number of lectures, paired lectures, total hours and total characters.
+        """
+        where, params = ("WHERE course = ?", (course,)) if course is not None else ("", ())
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS lectures, "
+            "SUM(wav_path IS NOT NULL AND transcript_txt_path IS NOT NULL) AS paired, "
+            "SUM(CASE WHEN wav_path IS NOT NULL AND transcript_txt_path IS NOT NULL "
+            "    THEN duration ELSE 0 END) AS seconds, "
+            "SUM(CASE WHEN wav_path IS NOT NULL AND transcript_txt_path IS NOT NULL "
+            "    THEN text_length ELSE 0 END) AS characters "
+            f"FROM lectures {where}",
+            params,
+        ).fetchone()
+        return {
+            "Lectures": row["lectures"] or 0,
+            "Paired Lectures": row["paired"] or 0,
+            "Total Hours": (row["seconds"] or 0) / 3600,
+            "Total Characters": row["characters"] or 0,
+        }
+
+
+if __name__ == "__main__":
+    # Set up argument parsing
+    parser = argparse.ArgumentParser(description="Print the stage status and statistics stored in a lecture catalogue.")
+    parser.add_argument("-db", "--catalogue", required=True, help="Path to the SQLite lecture catalogue.")
+    parser.add_argument("-c", "--course", default=None, help="Restrict the report to a single course key.")
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    with LectureCatalogue(args.catalogue) as catalogue:
+        print("Stage Status:")
+        for (stage, status), count in sorted(catalogue.stage_counts(args.course).items()):
+            print(f"{stage} ({status}): {count}")
+
+        print("Summary Statistics:")
+        for key, value in catalogue.summary(args.course).items():
+            print(f"{key}: {value}")
@@ -2,6 +2,8 @@ import os
 import json
 import argparse
 from mutagen import File  # Import the File class from mutagen
+from catalogue import LectureCatalogue
+from dedup import DedupIndex
 
 
 def get_audio_duration(filepath):
@@ -18,6 +20,83 @@ def get_audio_duration(filepath):
     return audio.info.length  # Return the duration in seconds
 
 
+def write_manifest_entry(manifest_file, audio_path, duration, transcription_path):
+    """
+    Write a single manifest line for an audio/transcription pair.
+    
+    Args:
+        manifest_file (file): Open manifest file to write to.
+        audio_path (str): Path to the audio file.
+        duration (float): Duration of the audio in seconds.
+        transcription_path (str): Path to the transcription file.
+    """
+    # Read transcription
+    with open(transcription_path, 'r', encoding='utf-8') as transcription_file:
+        transcription_text = transcription_file.read().strip()
+    
+    # Create JSON line
+    manifest_entry = {
+        "audio_filepath": audio_path,
+        "duration": duration,
+        "text": transcription_text
+    }
+    manifest_file.write(json.dumps(manifest_entry) + '\n')
+
+
+def generate_manifest_from_catalogue(catalogue, output_manifest_path, course=None, skip_duplicates=False):
+    """
+    Generate a training manifest JSONL file from the lectures in a catalogue
+    that have both a cropped WAV file and a cleaned transcript.
+    
+    Args:
+        catalogue (LectureCatalogue): Catalogue to read audio/transcript pairs from.
+        output_manifest_path (str): Path to save the output manifest JSONL file.
+        course (str): Course key to restrict the manifest to, or None for every course.
+        skip_duplicates (bool): Leave out lectures flagged as duplicates in the dedup index
+            whose original lecture is written to this manifest.
+    """
+    dedup = DedupIndex(catalogue) if skip_duplicates else None
+    lectures = catalogue.lectures(course, require=("wav_path", "transcript_txt_path"))
+    
+    # Map each flagged duplicate to its original, and write the other lectures first
+    originals = {}
+    if dedup:
+        for lecture in lectures:
+            duplicate = dedup.duplicate_of(lecture["course"], lecture["lecture_idx"])
+            if duplicate:
+                originals[(lecture["course"], lecture["lecture_idx"])] = (
+                    duplicate["duplicate_course"], duplicate["duplicate_lecture_idx"])
+        lectures.sort(key=lambda lecture: (lecture["course"], lecture["lecture_idx"]) in originals)
+    
+    written = set()
+    with open(output_manifest_path, 'w', encoding='utf-8') as manifest_file:
+        for lecture in lectures:
+            key = (lecture["course"], lecture["lecture_idx"])
+            
+            # Skip near-duplicates only if the original was written to this manifest
+            if originals.get(key) in written:
+                print(f"Skipping duplicate lecture {lecture['wav_path']}")
+                catalogue.set_stage_status(lecture["course"], lecture["lecture_idx"], "manifest", "skipped")
+                continue
+            
+            try:
+                # Use the duration recorded at cropping time, falling back to reading the file
+                duration = lecture["duration"]
+                if duration is None:
+                    duration = get_audio_duration(lecture["wav_path"])
+                    catalogue.upsert_lecture(lecture["course"], lecture["lecture_idx"], duration=duration)
+                
+                write_manifest_entry(manifest_file, lecture["wav_path"], duration, lecture["transcript_txt_path"])
+                written.add(key)
+                catalogue.set_stage_status(lecture["course"], lecture["lecture_idx"], "manifest", "done")
+            
+            except Exception as e:
+                print(f"Error processing {lecture['wav_path']}: {e}")
+                catalogue.set_stage_status(lecture["course"], lecture["lecture_idx"], "manifest", "failed")
+    
+    print(f"Training manifest file saved to {output_manifest_path}")
+
+
 def generate_manifest(audio_folder, transcription_folder, output_manifest_path):
     """
     Generate a training manifest JSONL file.
@@ -34,7 +113,7 @@ def generate_manifest(audio_folder, transcription_folder, output_manifest_path):
         for audio_file in audio_files:
             # Derive the corresponding transcription file name
             index = audio_file.split('_')[1].split('.')[0]  # Extract index from audio file (e.g., 'audio_0' -> '0')
-            transcription_file = f"document_{index}.txt"
+            transcription_file = f"transcript_{index}.txt"
             
             # Build full paths for audio and transcription
             audio_path = os.path.join(audio_folder, audio_file)
@@ -46,17 +125,7 @@ def generate_manifest(audio_folder, transcription_folder, output_manifest_path):
                     # Get audio duration
                     duration = get_audio_duration(audio_path)
                     
-                    # Read transcription
-                    with open(transcription_path, 'r', encoding='utf-8') as transcription_file:
-                        transcription_text = transcription_file.read().strip()
-                    
-                    # Create JSON line
-                    manifest_entry = {
-                        "audio_filepath": audio_path,
-                        "duration": duration,
-                        "text": transcription_text
-                    }
-                    manifest_file.write(json.dumps(manifest_entry) + '\n')
+                    write_manifest_entry(manifest_file, audio_path, duration, transcription_path)
                 
                 except Exception as e:
                     print(f"Error processing {audio_file}: {e}")
@@ -69,12 +138,22 @@ def generate_manifest(audio_folder, transcription_folder, output_manifest_path):
 if __name__ == "__main__":
     # Set up argument parsing
     parser = argparse.ArgumentParser(description="Generate a training manifest JSONL file.")
-    parser.add_argument("-aud", "--audio_folder", required=True, help="Path to the folder containing audio files.")
-    parser.add_argument("-tran", "--transcription_folder", required=True, help="Path to the folder containing transcription files.")
+    parser.add_argument("-aud", "--audio_folder", default=None, help="Path to the folder containing audio files (not needed with --catalogue).")
+    parser.add_argument("-tran", "--transcription_folder", default=None, help="Path to the folder containing transcription files (not needed with --catalogue).")
     parser.add_argument("-op", "--output_manifest", required=True, help="Path to save the output manifest JSONL file.")
+    parser.add_argument("-db", "--catalogue", default=None, help="Optional SQLite lecture catalogue to read audio/transcript pairs from.")
+    parser.add_argument("-c", "--course", default=None, help="Restrict a catalogue manifest to a single course key.")
+    parser.add_argument("--skip_duplicates", action="store_true", help="Leave out lectures flagged as duplicates in the catalogue.")
     
     # Parse arguments
     args = parser.parse_args()
     
     # Call the function with the provided arguments
-    generate_manifest(args.audio_folder, args.transcription_folder, args.output_manifest)
+    if args.catalogue:
+        with LectureCatalogue(args.catalogue) as catalogue:
+            generate_manifest_from_catalogue(catalogue, args.output_manifest, course=args.course,
+                                             skip_duplicates=args.skip_duplicates)
+    elif args.audio_folder and args.transcription_folder:
+        generate_manifest(args.audio_folder, args.transcription_folder, args.output_manifest)
+    else:
+        parser.error("--audio_folder and --transcription_folder are required without --catalogue")
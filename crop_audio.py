@@ -2,19 +2,27 @@ import os
 import wave
 import contextlib
 import argparse
+from catalogue import LectureCatalogue, lecture_index_from_filename
 
 
-def crop_last_10_seconds(input_folder, output_folder):
+def crop_last_10_seconds(input_folder, output_folder, catalogue=None, course=None):
     """
     Crops the last 10 seconds from all .wav files in the input folder and saves the cropped files in the output folder.
 
     Args:
         input_folder (str): Path to the folder containing input .wav files.
         output_folder (str): Path to the folder where cropped .wav files will be saved.
+        catalogue (LectureCatalogue): Optional catalogue to record cropped files and durations in.
+        course (str): Course key used in the catalogue.
 
     Outputs:
-        Cropped .wav files are saved in the specified output folder.
+        Cropped .wav files are saved in the specified output folder, under a
+        subfolder named after the course when a catalogue is given.
     """
+    # Keep courses apart, since every course numbers its lectures from 0
+    if catalogue:
+        output_folder = os.path.join(output_folder, course)
+
     # Create the output folder if it doesn't exist
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
@@ -52,6 +60,13 @@ def crop_last_10_seconds(input_folder, output_folder):
                     
             print(f"Cropped: {filename} -> {output_path}")
 
+            # Record the cropped file and its duration against the lecture
+            lecture_idx = lecture_index_from_filename(filename)
+            if catalogue and lecture_idx is not None:
+                catalogue.upsert_lecture(course, lecture_idx, wav_path=output_path,
+                                         duration=crop_frames / float(framerate))
+                catalogue.set_stage_status(course, lecture_idx, "crop_audio", "done")
+
 if __name__ == "__main__":
     """
     Parses command-line arguments and calls the crop_last_10_seconds function with the specified input and output paths.
@@ -59,8 +74,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Crop the last 10 seconds from .wav files in the input folder and save them to the output folder.")
     parser.add_argument('-i', '--input', required=True, help="Path to the input folder containing .wav files.")
     parser.add_argument('-o', '--output', required=True, help="Path to the output folder where cropped files will be saved.")
+    parser.add_argument('-db', '--catalogue', default=None, help="Optional SQLite lecture catalogue to record cropped files in.")
+    parser.add_argument('-c', '--course', default=None, help="Course key for the catalogue (required with --catalogue).")
     
     args = parser.parse_args()
+    if args.catalogue and not args.course:
+        parser.error("--course is required when --catalogue is given")
+
+    catalogue = LectureCatalogue(args.catalogue) if args.catalogue else None
     
     # Call the crop function with the provided arguments
-    crop_last_10_seconds(args.input, args.output)
+    crop_last_10_seconds(args.input, args.output, catalogue=catalogue, course=args.course)
+
+    if catalogue:
+        catalogue.close()
@@ -4,9 +4,10 @@ import pandas as pd
 import re
 import argparse
 from collections import Counter
+from catalogue import LectureCatalogue
 
 
-def process_jsonl(input_path, output_folder):
+def process_jsonl(input_path, output_folder, catalogue=None):
     """
     Process a JSONL file to extract audio metadata, compute statistics, 
     and save detailed and summary outputs to CSV files.
@@ -14,6 +15,7 @@ def process_jsonl(input_path, output_folder):
     Args:
         input_path (str): Path to the input JSONL file.
         output_folder (str): Path to the output folder.
+        catalogue (LectureCatalogue): Optional catalogue to look up courses and audio IDs by file path.
     """
     # Validate output folder exists
     if not os.path.exists(output_folder):
@@ -22,6 +24,7 @@ def process_jsonl(input_path, output_folder):
     # Initialize lists to store extracted data
     audio_filepaths = []
     audio_ids = []
+    courses = []
     durations = []
     texts = []
     
@@ -32,9 +35,15 @@ def process_jsonl(input_path, output_folder):
             audio_filepaths.append(data["audio_filepath"])
             durations.append(data["duration"])
             texts.append(data["text"])
-            # Extract audio ID from the file path
-            audio_id = re.search(r'audio_(\d+)\.wav$', data["audio_filepath"])
-            audio_ids.append(int(audio_id.group(1)) if audio_id else None)
+            # Look up the course and audio ID in the catalogue, falling back to the file path
+            lecture = catalogue.find_by_wav_path(data["audio_filepath"]) if catalogue else None
+            if lecture:
+                courses.append(lecture["course"])
+                audio_ids.append(lecture["lecture_idx"])
+            else:
+                audio_id = re.search(r'audio_(\d+)\.wav$', data["audio_filepath"])
+                courses.append(None)
+                audio_ids.append(int(audio_id.group(1)) if audio_id else None)
     
     # Compute additional fields
     words_count = [len(text.split()) for text in texts]  # Number of words per utterance
@@ -59,6 +68,7 @@ def process_jsonl(input_path, output_folder):
     
     # Prepare the final DataFrame
     data = {
+        "course": courses,
         "audio_id": audio_ids,
         "audio_filepath": audio_filepaths,
         "duration": durations,
@@ -107,9 +117,15 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process a JSONL file and save extracted data and statistics to CSV files.")
     parser.add_argument("-i", "--input_path", required=True, help="Path to the input JSONL file.")
     parser.add_argument("-o", "--output_folder", required=True, help="Path to the output folder where CSV files will be saved.")
+    parser.add_argument("-db", "--catalogue", default=None, help="Optional SQLite lecture catalogue to look up audio IDs in.")
     
     # Parse arguments
     args = parser.parse_args()
     
+    catalogue = LectureCatalogue(args.catalogue) if args.catalogue else None
+    
     # Call the function with the provided arguments
-    process_jsonl(args.input_path, args.output_folder)
+    process_jsonl(args.input_path, args.output_folder, catalogue=catalogue)
+    
+    if catalogue:
+        catalogue.close()
@@ -0,0 +1,710 @@
+import wave
+import zlib
+import hashlib
+import argparse
+import contextlib
+from collections import Counter, defaultdict
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from catalogue import LectureCatalogue, LECTURE_FIELDS
+
+
+# MinHash / LSH parameters: 16 bands of 8 rows put the LSH candidate threshold near 0.7
+NUM_PERM = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures stay comparable across runs. Coefficients and tokens
+# are below 2**32, so a * x + b fits in uint64 without wrapping before the mod p.
+_rng = np.random.RandomState(1)
+PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+# Text shingle size in words, and the fewest shingles a transcript needs to be compared
+SHINGLE_SIZE = 5
+MIN_TEXT_SHINGLES = 20
+
+# Audio fingerprint parameters (frames of 256 ms with an 8 ms hop at 16 kHz, i.e. 31/32 overlap)
+FRAME_SIZE = 4096
+HOP_SIZE = 128
+NUM_FINGERPRINT_BANDS = 33
+MIN_FREQ = 300
+MAX_FREQ = 2000
+BLOCK_FRAMES = HOP_SIZE * 1024
+
+# Audio matching: sub-fingerprints kept in the lookup table (1 in 2**INDEX_SAMPLING_BITS),
+# offset votes needed for a candidate, and bit error rate accepted per verification block
+INDEX_SAMPLING_BITS = 6
+MAX_POSTINGS = 200
+MIN_VOTES = 3
+MAX_CANDIDATES = 3
+VERIFY_BLOCK = 256
+MAX_BIT_ERROR_RATE = 0.35
+MIN_AUDIO_FRAMES = VERIFY_BLOCK * 4
+
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (course, lecture_idx, kind)
+);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_bucket ON lsh_buckets (kind, band, bucket);
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_lecture ON lsh_buckets (course, lecture_idx, kind);
+
+CREATE TABLE IF NOT EXISTS audio_index (
+    value INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audio_index_value ON audio_index (value);
+CREATE INDEX IF NOT EXISTS idx_audio_index_lecture ON audio_index (course, lecture_idx);
+
+CREATE TABLE IF NOT EXISTS duplicates (
+    course TEXT NOT NULL,
+    lecture_idx INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    duplicate_course TEXT NOT NULL,
+    duplicate_lecture_idx INTEGER NOT NULL,
+    similarity REAL NOT NULL,
+    PRIMARY KEY (course, lecture_idx, kind)
+);
+"""
+
+
+def minhash(tokens):
+    """
+    Compute the MinHash signature of a set of 32-bit integer tokens.
+
+    Args:
+        tokens (iterable): 32-bit integer tokens, such as word shingle hashes.
+
+    Returns:
+        numpy.ndarray: Signature of NUM_PERM uint32 values.
+    """
+    tokens = np.fromiter(tokens, dtype=np.uint64)
+    if tokens.size == 0:
+        raise ValueError("Cannot compute the MinHash signature of an empty token set")
+
+    # Universal hashing (a * x + b) mod p, one column per permutation
+    hashed = (np.outer(tokens, PERM_A) + PERM_B) % MERSENNE_PRIME & MAX_HASH
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def text_tokens(text):
+    """
+    Split cleaned transcript text into hashed word shingles.
+
+    Args:
+        text (str): Cleaned transcript text.
+
+    Returns:
+        set: 32-bit hashes of the word shingles.
+    """
+    words = text.split()
+    shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))]
+    return {int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+            for shingle in shingles if shingle}
+
+
+def audio_fingerprint(wav_path):
+    """
+    Compute the 32-bit sub-fingerprints of a 16-bit PCM WAV file.
+
+    Each frame is summarised by the signs of the energy differences between
+    adjacent frequency bands and consecutive frames (Haitsma-Kalker). With
+    heavily overlapping frames, a noisy, re-encoded or slightly offset copy of
+    the same recording keeps a low bit error rate against the original.
+
+    Args:
+        wav_path (str): Path to the WAV file.
+
+    Returns:
+        numpy.ndarray: One uint32 sub-fingerprint per frame, in time order.
+    """
+    with contextlib.closing(wave.open(wav_path, 'rb')) as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit PCM audio in {wav_path}")
+        n_channels = wav_file.getnchannels()
+        framerate = wav_file.getframerate()
+
+        # Logarithmically spaced band edges, as FFT bin indices
+        edges = np.geomspace(MIN_FREQ, MAX_FREQ, NUM_FINGERPRINT_BANDS + 1)
+        edges = np.unique((edges * FRAME_SIZE / framerate).astype(int))
+        window = np.hanning(FRAME_SIZE).astype(np.float32)
+        weights = np.uint64(1) << np.arange(len(edges) - 2, dtype=np.uint64)
+
+        fingerprint = []
+        leftover = np.zeros(0, dtype=np.float32)
+        previous = None
+        while True:
+            raw = wav_file.readframes(BLOCK_FRAMES)
+            if not raw:
+                break
+
+            # Mix down to mono and prepend the samples not yet covered by a frame
+            samples = np.frombuffer(raw, dtype='<i2').astype(np.float32)
+            if n_channels > 1:
+                samples = samples.reshape(-1, n_channels).mean(axis=1)
+            samples = np.concatenate([leftover, samples])
+            if len(samples) < FRAME_SIZE:
+                leftover = samples
+                continue
+
+            frames = sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+            leftover = samples[len(frames) * HOP_SIZE:]
+
+            # Band energies and their differences across adjacent bands
+            spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+            energies = np.add.reduceat(spectrum[:, :edges[-1]], edges[:-1], axis=1)
+            band_diff = energies[:, :-1] - energies[:, 1:]
+
+            # Compare with the previous frame, carrying it across blocks
+            if previous is not None:
+                band_diff = np.vstack([previous, band_diff])
+            previous = band_diff[-1:]
+            if len(band_diff) < 2:
+                continue
+            bits = (band_diff[1:] - band_diff[:-1]) > 0
+            fingerprint.append((bits.astype(np.uint64) * weights).sum(axis=1).astype(np.uint32))
+
+    if not fingerprint:
+        return np.zeros(0, dtype=np.uint32)
+    return np.concatenate(fingerprint)
+
+
+def sampled_positions(fingerprint):
+    """
+    Select the frames whose sub-fingerprints go into the lookup table.
+
+    Selection depends only on the sub-fingerprint value, so copies of a
+    recording sample the same content regardless of where they start.
+
+    Args:
+        fingerprint (numpy.ndarray): Sub-fingerprints of a recording.
+
+    Returns:
+        numpy.ndarray: Frame positions of the sampled sub-fingerprints.
+    """
+    mixed = (fingerprint.astype(np.uint64) * np.uint64(2654435761)) & MAX_HASH
+    keep = (mixed >> np.uint64(32 - INDEX_SAMPLING_BITS)) == 0
+    keep &= (fingerprint != 0) & (fingerprint != np.uint32(MAX_HASH))
+    return np.nonzero(keep)[0]
+
+
+def informative_blocks(fingerprint):
+    """
+    Flag the verification blocks of a fingerprint that are not mostly silence.
+
+    Args:
+        fingerprint (numpy.ndarray): Sub-fingerprints of a recording.
+
+    Returns:
+        numpy.ndarray: One boolean per complete block of VERIFY_BLOCK frames.
+    """
+    n_blocks = len(fingerprint) // VERIFY_BLOCK
+    blocks = fingerprint[:n_blocks * VERIFY_BLOCK].reshape(n_blocks, VERIFY_BLOCK)
+    return (blocks != 0).mean(axis=1) >= 0.5
+
+
+def fingerprint_similarity(query, reference, offset):
+    """
+    Compare two fingerprints aligned at a frame offset.
+
+    Args:
+        query (numpy.ndarray): Sub-fingerprints of the new recording.
+        reference (numpy.ndarray): Sub-fingerprints of the indexed recording.
+        offset (int): Frame in the reference that lines up with frame 0 of the query.
+
+    Returns:
+        float: Matching informative blocks (bit error rate below MAX_BIT_ERROR_RATE)
+        over the union of both recordings' informative blocks, a Jaccard-like score
+        so that a short excerpt and the full lecture it comes from do not match.
+    """
+    start = max(0, -offset)
+    end = min(len(query), len(reference) - offset)
+    n_blocks = max(0, end - start) // VERIFY_BLOCK
+    if n_blocks == 0:
+        return 0.0
+
+    aligned_query = query[start:start + n_blocks * VERIFY_BLOCK]
+    aligned_reference = reference[start + offset:start + offset + n_blocks * VERIFY_BLOCK]
+    errors = np.unpackbits((aligned_query ^ aligned_reference).astype('<u4').view(np.uint8))
+    bit_error_rate = errors.reshape(n_blocks, VERIFY_BLOCK * 32).mean(axis=1)
+    matched = (bit_error_rate < MAX_BIT_ERROR_RATE) & informative_blocks(aligned_query)
+
+    union = informative_blocks(query).sum() + informative_blocks(reference).sum() - matched.sum()
+    return float(matched.sum() / union) if union else 0.0
+
+
+class DedupIndex:
+    """
+    Near-duplicate lecture index stored alongside the lecture catalogue.
+
+    Transcripts are indexed with MinHash signatures bucketed by LSH bands, so each
+    lookup is a fixed number of indexed bucket queries regardless of corpus size.
+    Audio is indexed by a sample of its sub-fingerprints; exact matches vote for a
+    candidate lecture and offset, which is then confirmed by the bit error rate of
+    the aligned fingerprints. The first lecture indexed with given content is kept;
+    later near-duplicates are recorded against it and left out of the index.
+    """
+
+    def __init__(self, catalogue, threshold=0.8):
+        """
+        Attach the index to a catalogue, creating its tables if needed.
+
+        Args:
+            catalogue (LectureCatalogue): Catalogue whose database holds the index.
+            threshold (float): Minimum similarity to flag a duplicate: estimated Jaccard
+                similarity of word shingles for text, of fingerprint blocks for audio.
+        """
+        self.catalogue = catalogue
+        self.conn = catalogue.conn
+        self.threshold = threshold
+        self.conn.executescript(DEDUP_SCHEMA)
+
+    @staticmethod
+    def band_buckets(signature):
+        """
+        Hash each LSH band of a signature to a bucket key.
+
+        Args:
+            signature (numpy.ndarray): MinHash signature.
+
+        Returns:
+            list: Bucket keys, one per band.
+        """
+        bands = signature.astype('<u4').reshape(NUM_BANDS, ROWS_PER_BAND)
+        return [int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+                for band in bands]
+
+    def has_signature(self, course, lecture_idx, kind):
+        """
+        Check whether a lecture has already been indexed.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            kind (str): Signature kind ('text' or 'audio').
+
+        Returns:
+            bool: True if a signature of this kind is stored.
+        """
+        row = self.conn.execute(
+            "SELECT 1 FROM signatures WHERE course = ? AND lecture_idx = ? AND kind = ?",
+            (course, int(lecture_idx), kind),
+        ).fetchone()
+        return row is not None
+
+    def query(self, kind, signature, exclude=None):
+        """
+        Find the most similar indexed lecture sharing at least one LSH bucket.
+
+        Args:
+            kind (str): Signature kind ('text' or 'audio').
+            signature (numpy.ndarray): MinHash signature to look up.
+            exclude (tuple): (course, lecture index) to ignore, usually the lecture itself.
+
+        Returns:
+            tuple: (course, lecture index, similarity) of the best match at or above
+            the threshold, or None.
+        """
+        candidates = set()
+        for band, bucket in enumerate(self.band_buckets(signature)):
+            rows = self.conn.execute(
+                "SELECT course, lecture_idx FROM lsh_buckets WHERE kind = ? AND band = ? AND bucket = ?",
+                (kind, band, bucket),
+            ).fetchall()
+            candidates.update((row["course"], row["lecture_idx"]) for row in rows)
+        candidates.discard(exclude)
+
+        best = None
+        for course, lecture_idx in candidates:
+            row = self.conn.execute(
+                "SELECT signature FROM signatures WHERE course = ? AND lecture_idx = ? AND kind = ?",
+                (course, lecture_idx, kind),
+            ).fetchone()
+            other = np.frombuffer(row["signature"], dtype='<u4')
+            similarity = float(np.mean(signature == other))
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (course, lecture_idx, similarity)
+        return best
+
+    def add(self, course, lecture_idx, kind, signature):
+        """
+        Index a lecture signature, flagging it if it duplicates an indexed lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            kind (str): Signature kind ('text' or 'audio').
+            signature (numpy.ndarray): MinHash signature.
+
+        Returns:
+            tuple: (course, lecture index, similarity) of the original lecture if this
+            one is a duplicate, otherwise None.
+        """
+        lecture_idx = int(lecture_idx)
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM lsh_buckets WHERE course = ? AND lecture_idx = ? AND kind = ?",
+                (course, lecture_idx, kind),
+            )
+            self.conn.execute(
+                "DELETE FROM duplicates WHERE course = ? AND lecture_idx = ? AND kind = ?",
+                (course, lecture_idx, kind),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO signatures (course, lecture_idx, kind, signature) VALUES (?, ?, ?, ?)",
+                (course, lecture_idx, kind, signature.astype('<u4').tobytes()),
+            )
+
+        match = self.query(kind, signature, exclude=(course, lecture_idx))
+        if match:
+            self.mark_duplicate(course, lecture_idx, kind, *match)
+        else:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO lsh_buckets (kind, band, bucket, course, lecture_idx) VALUES (?, ?, ?, ?, ?)",
+                    [(kind, band, bucket, course, lecture_idx)
+                     for band, bucket in enumerate(self.band_buckets(signature))],
+                )
+            self.update_stage_status(course, lecture_idx)
+        return match
+
+    def index_text(self, course, lecture_idx, text):
+        """
+        Index the cleaned transcript text of a lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            text (str): Cleaned transcript text.
+
+        Returns:
+            tuple: Original lecture if this one is a duplicate, otherwise None.
+        """
+        tokens = text_tokens(text)
+        if len(tokens) < MIN_TEXT_SHINGLES:
+            return self.skip(course, lecture_idx, "text")
+        return self.add(course, lecture_idx, "text", minhash(tokens))
+
+    def index_audio(self, course, lecture_idx, wav_path):
+        """
+        Index the audio fingerprint of a lecture, flagging it if it duplicates an
+        indexed lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            wav_path (str): Path to the 16 kHz WAV file.
+
+        Returns:
+            tuple: Original lecture if this one is a duplicate, otherwise None.
+        """
+        fingerprint = audio_fingerprint(wav_path)
+        if np.count_nonzero(fingerprint) < MIN_AUDIO_FRAMES:
+            return self.skip(course, lecture_idx, "audio")
+
+        lecture_idx = int(lecture_idx)
+        positions = sampled_positions(fingerprint)
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM audio_index WHERE course = ? AND lecture_idx = ?", (course, lecture_idx)
+            )
+            self.conn.execute(
+                "DELETE FROM duplicates WHERE course = ? AND lecture_idx = ? AND kind = 'audio'",
+                (course, lecture_idx),
+            )
+            # Keep the full fingerprint so later matches are verified without the WAV file
+            self.conn.execute(
+                "INSERT OR REPLACE INTO signatures (course, lecture_idx, kind, signature) VALUES (?, ?, ?, ?)",
+                (course, lecture_idx, "audio", zlib.compress(fingerprint.astype('<u4').tobytes())),
+            )
+
+        match = self.query_audio(fingerprint, positions, exclude=(course, lecture_idx))
+        if match:
+            self.mark_duplicate(course, lecture_idx, "audio", *match)
+        else:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO audio_index (value, course, lecture_idx, position) VALUES (?, ?, ?, ?)",
+                    [(int(fingerprint[position]), course, lecture_idx, int(position)) for position in positions],
+                )
+            self.update_stage_status(course, lecture_idx)
+        return match
+
+    def query_audio(self, fingerprint, positions, exclude=None):
+        """
+        Find the indexed lecture whose audio best matches a fingerprint.
+
+        Args:
+            fingerprint (numpy.ndarray): Sub-fingerprints of the new recording.
+            positions (numpy.ndarray): Frame positions of its sampled sub-fingerprints.
+            exclude (tuple): (course, lecture index) to ignore, usually the lecture itself.
+
+        Returns:
+            tuple: (course, lecture index, similarity) of the best match at or above
+            the threshold, or None.
+        """
+        query_positions = defaultdict(list)
+        for position in positions:
+            query_positions[int(fingerprint[position])].append(int(position))
+
+        # Each exact sub-fingerprint match votes for a lecture and frame offset
+        postings = defaultdict(list)
+        values = list(query_positions)
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT value, course, lecture_idx, position FROM audio_index "
+                f"WHERE value IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                postings[row["value"]].append((row["course"], row["lecture_idx"], row["position"]))
+
+        votes = Counter()
+        for value, entries in postings.items():
+            if len(entries) > MAX_POSTINGS:
+                continue
+            for course, lecture_idx, reference_position in entries:
+                if (course, lecture_idx) == exclude:
+                    continue
+                for query_position in query_positions[value]:
+                    votes[(course, lecture_idx, reference_position - query_position)] += 1
+
+        # Confirm the best-voted lectures against their full fingerprints
+        best = None
+        checked = set()
+        for (course, lecture_idx, offset), count in votes.most_common():
+            if count < MIN_VOTES or len(checked) >= MAX_CANDIDATES:
+                break
+            if (course, lecture_idx) in checked:
+                continue
+            checked.add((course, lecture_idx))
+
+            reference = self.stored_fingerprint(course, lecture_idx)
+            if reference is None:
+                continue
+
+            similarity = fingerprint_similarity(fingerprint, reference, offset)
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (course, lecture_idx, similarity)
+        return best
+
+    def stored_fingerprint(self, course, lecture_idx):
+        """
+        Load the full audio fingerprint stored for an indexed lecture.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+
+        Returns:
+            numpy.ndarray: Sub-fingerprints of the lecture, or None if it has none stored.
+        """
+        row = self.conn.execute(
+            "SELECT signature FROM signatures WHERE course = ? AND lecture_idx = ? AND kind = 'audio'",
+            (course, int(lecture_idx)),
+        ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(zlib.decompress(row["signature"]), dtype='<u4').astype(np.uint32)
+
+    def skip(self, course, lecture_idx, kind):
+        """
+        Leave a lecture with too little content out of the index, so that empty
+        transcripts or silent audio are never compared with each other.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            kind (str): Signature kind ('text' or 'audio').
+
+        Returns:
+            None: Skipped lectures are never duplicates.
+        """
+        lecture_idx = int(lecture_idx)
+        with self.conn:
+            for table in ("lsh_buckets", "duplicates", "signatures"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE course = ? AND lecture_idx = ? AND kind = ?",
+                    (course, lecture_idx, kind),
+                )
+            if kind == "audio":
+                self.conn.execute(
+                    "DELETE FROM audio_index WHERE course = ? AND lecture_idx = ?", (course, lecture_idx)
+                )
+        print(f"Skipping {kind} deduplication for {course}/{lecture_idx}: too little content")
+        self.update_stage_status(course, lecture_idx)
+        return None
+
+    def find_url_duplicate(self, course, lecture_idx, audio_url):
+        """
+        Find another lecture whose audio was already downloaded from the same URL,
+        flagging this lecture as its duplicate.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            audio_url (str): URL the audio would be downloaded from.
+
+        Returns:
+            tuple: (course, lecture index, similarity) of the original lecture, or None.
+        """
+        row = self.conn.execute(
+            "SELECT course, lecture_idx FROM lectures "
+            "WHERE audio_url = ? AND audio_path IS NOT NULL AND NOT (course = ? AND lecture_idx = ?) "
+            "ORDER BY course, lecture_idx LIMIT 1",
+            (audio_url, course, int(lecture_idx)),
+        ).fetchone()
+        if row is None:
+            return None
+        match = (row["course"], row["lecture_idx"], 1.0)
+        self.mark_duplicate(course, lecture_idx, "url", *match)
+        return match
+
+    def mark_duplicate(self, course, lecture_idx, kind, duplicate_course, duplicate_lecture_idx, similarity):
+        """
+        Record that a lecture duplicates another one.
+
+        Args:
+            course (str): Course key of the duplicate.
+            lecture_idx (int): Lecture index of the duplicate.
+            kind (str): How the duplicate was detected ('url', 'text' or 'audio').
+            duplicate_course (str): Course key of the original lecture.
+            duplicate_lecture_idx (int): Lecture index of the original lecture.
+            similarity (float): Similarity to the original (1.0 for a shared URL).
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO duplicates "
+                "(course, lecture_idx, kind, duplicate_course, duplicate_lecture_idx, similarity) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (course, int(lecture_idx), kind, duplicate_course, int(duplicate_lecture_idx), similarity),
+            )
+        self.update_stage_status(course, lecture_idx)
+
+    def duplicate_of(self, course, lecture_idx, require=()):
+        """
+        Look up the lecture that a lecture duplicates, optionally only if that
+        original is available to stand in for it.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+            require (iterable): Names of fields in LECTURE_FIELDS that must be non-null
+                for the original lecture.
+
+        Returns:
+            dict: Duplicate record with the original lecture and similarity, or None.
+        """
+        unknown = set(require) - set(LECTURE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown catalogue fields: {', '.join(sorted(unknown))}")
+
+        conditions = ["d.course = ?", "d.lecture_idx = ?"] + [f"l.{field} IS NOT NULL" for field in require]
+        params = [course, int(lecture_idx)]
+
+        row = self.conn.execute(
+            "SELECT d.* FROM duplicates d "
+            "JOIN lectures l ON l.course = d.duplicate_course AND l.lecture_idx = d.duplicate_lecture_idx "
+            f"WHERE {' AND '.join(conditions)} ORDER BY d.similarity DESC LIMIT 1",
+            params,
+        ).fetchone()
+        return dict(row) if row else None
+
+    def update_stage_status(self, course, lecture_idx):
+        """
+        Set the 'dedup' stage status from the recorded duplicates and signatures
+        of a lecture: 'duplicate', 'unique', or 'skipped' if nothing was indexed.
+
+        Args:
+            course (str): Course key.
+            lecture_idx (int): Lecture index within the course.
+        """
+        if self.duplicate_of(course, lecture_idx):
+            status = "duplicate"
+        elif self.conn.execute(
+            "SELECT 1 FROM signatures WHERE course = ? AND lecture_idx = ?", (course, int(lecture_idx))
+        ).fetchone():
+            status = "unique"
+        else:
+            status = "skipped"
+        self.catalogue.set_stage_status(course, lecture_idx, "dedup", status)
+
+
+def index_catalogue(catalogue, course=None, text=True, audio=True, reindex=False, threshold=0.8):
+    """
+    Index the transcripts and/or audio of catalogued lectures and report duplicates.
+
+    Args:
+        catalogue (LectureCatalogue): Catalogue holding the lectures and the index.
+        course (str): Course key to index, or None for every course.
+        text (bool): Index cleaned transcript text.
+        audio (bool): Index audio fingerprints of the cropped WAV files.
+        reindex (bool): Recompute signatures of lectures that are already indexed.
+        threshold (float): Minimum similarity to flag a duplicate.
+    """
+    index = DedupIndex(catalogue, threshold=threshold)
+    stages = []
+    if text:
+        stages.append(("text", "transcript_txt_path"))
+    if audio:
+        stages.append(("audio", "wav_path"))
+
+    for kind, field in stages:
+        for lecture in catalogue.lectures(course, require=(field,)):
+            lecture_course, lecture_idx = lecture["course"], lecture["lecture_idx"]
+            if not reindex and index.has_signature(lecture_course, lecture_idx, kind):
+                continue
+
+            try:
+                if kind == "text":
+                    with open(lecture[field], 'r', encoding='utf-8') as transcription_file:
+                        match = index.index_text(lecture_course, lecture_idx, transcription_file.read())
+                else:
+                    match = index.index_audio(lecture_course, lecture_idx, lecture[field])
+            except Exception as e:
+                print(f"Error indexing {lecture[field]}: {e}")
+                continue
+
+            if match:
+                print(f"Duplicate ({kind}): {lecture_course}/{lecture_idx} -> {match[0]}/{match[1]} "
+                      f"(similarity {match[2]:.2f})")
+
+    print("Deduplication index updated")
+
+
+if __name__ == "__main__":
+    # Set up argument parsing
+    parser = argparse.ArgumentParser(description="Detect near-duplicate lectures across courses using MinHash text signatures and audio fingerprints.")
+    parser.add_argument("-db", "--catalogue", required=True, help="Path to the SQLite lecture catalogue.")
+    parser.add_argument("-c", "--course", default=None, help="Restrict indexing to a single course key.")
+    parser.add_argument("--text", action="store_true", help="Index cleaned transcript text only.")
+    parser.add_argument("--audio", action="store_true", help="Index audio fingerprints only.")
+    parser.add_argument("--reindex", action="store_true", help="Recompute signatures of lectures that are already indexed.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.8, help="Minimum similarity to flag a duplicate (default: 0.8).")
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    # Index both kinds unless one is selected
+    index_text, index_audio = (args.text, args.audio) if (args.text or args.audio) else (True, True)
+
+    with LectureCatalogue(args.catalogue) as catalogue:
+        index_catalogue(catalogue, course=args.course, text=index_text, audio=index_audio,
+                        reindex=args.reindex, threshold=args.threshold)
@@ -6,6 +6,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
+from catalogue import LectureCatalogue, course_key_from_url, file_checksum
+from dedup import DedupIndex
 
 
 class NPTELDownloader:
@@ -13,16 +15,23 @@ class NPTELDownloader:
     A class to download audio files from NPTEL video lectures.
     """
 
-    def __init__(self, output_dir, course_url):
+    def __init__(self, output_dir, course_url, catalogue=None, course=None, skip_duplicates=False):
         """
         Initializes the downloader with the output directory and course URL.
         
         Args:
             output_dir (str): Directory where audio files will be saved.
             course_url (str): URL of the NPTEL course page.
+            catalogue (LectureCatalogue): Optional catalogue to record downloads in.
+            course (str): Course key used in the catalogue; derived from the URL if not given.
+            skip_duplicates (bool): Skip lectures already downloaded from the same URL or
+                flagged as duplicates in the catalogue's dedup index.
         """
         self.output_dir = output_dir
         self.course_url = course_url
+        self.catalogue = catalogue
+        self.course = course or course_key_from_url(course_url)
+        self.dedup = DedupIndex(catalogue) if catalogue and skip_duplicates else None
         self.driver = None
         self.video_links = []
 
@@ -86,6 +95,9 @@ class NPTELDownloader:
         Args:
             url (str): URL of the video.
             output_audio_path (str): Path where the audio file will be saved.
+
+        Returns:
+            bool: True if the audio was extracted successfully.
         """
         try:
             # Command to extract audio from the video URL
@@ -99,10 +111,12 @@ class NPTELDownloader:
             ]
             subprocess.run(command, check=True)  # Execute the ffmpeg command
             print(f"Audio saved to {output_audio_path}")
+            return True
         except subprocess.CalledProcessError as e:
             print(f"Error during audio extraction: {e}")
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
+        return False
 
     def download_videos(self):
         """
@@ -114,8 +128,53 @@ class NPTELDownloader:
         
         print("Downloading the audio...")
         for idx, link in enumerate(self.video_links):  # Iterate through video links
+            if self.dedup and self.is_duplicate(idx, link):
+                continue
             output_audio_path = os.path.join(self.output_dir, f"audio_{idx}.mp3")
-            self.download_audio_from_url(link, output_audio_path)  # Download each audio file
+            success = self.download_audio_from_url(link, output_audio_path)  # Download each audio file
+            if self.catalogue:
+                self.record_download(idx, link, output_audio_path, success)
+
+    def is_duplicate(self, idx, link):
+        """
+        Checks whether a lecture duplicates one whose audio is already downloaded, either
+        by sharing its video URL or by a transcript match in the dedup index.
+
+        Args:
+            idx (int): Lecture index within the course.
+            link (str): URL of the video.
+
+        Returns:
+            bool: True if the lecture was skipped as a duplicate.
+        """
+        # A shared URL is recorded as a duplicate, alongside any transcript match
+        self.dedup.find_url_duplicate(self.course, idx, link)
+        duplicate = self.dedup.duplicate_of(self.course, idx, require=("audio_path",))
+        if duplicate is None:
+            return False
+
+        print(f"Skipping audio_{idx}: duplicate of lecture {duplicate['duplicate_lecture_idx']} "
+              f"in course {duplicate['duplicate_course']}")
+        self.catalogue.upsert_lecture(self.course, idx, audio_url=link)
+        self.catalogue.set_stage_status(self.course, idx, "download_audio", "skipped")
+        return True
+
+    def record_download(self, idx, link, output_audio_path, success):
+        """
+        Records a downloaded audio file and its stage status in the catalogue.
+
+        Args:
+            idx (int): Lecture index within the course.
+            link (str): URL the audio was extracted from.
+            output_audio_path (str): Path where the audio file was saved.
+            success (bool): Whether the download succeeded.
+        """
+        if success:
+            self.catalogue.upsert_lecture(self.course, idx, audio_url=link, audio_path=output_audio_path,
+                                          audio_checksum=file_checksum(output_audio_path))
+        else:
+            self.catalogue.upsert_lecture(self.course, idx, audio_url=link)
+        self.catalogue.set_stage_status(self.course, idx, "download_audio", "done" if success else "failed")
 
 
 if __name__ == "__main__":
@@ -129,11 +188,22 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NPTEL Video Downloader")
     parser.add_argument("-o", "--output_dir",required=True, help="Directory to save audio files")
     parser.add_argument("-i", "--course_url", required=True, help="NPTEL course URL")
+    parser.add_argument("-db", "--catalogue", default=None, help="Optional SQLite lecture catalogue to record downloads in")
+    parser.add_argument("-c", "--course", default=None, help="Course key for the catalogue (defaults to the last segment of the course URL)")
+    parser.add_argument("--skip_duplicates", action="store_true", help="Skip lectures flagged as duplicates in the catalogue (requires --catalogue)")
     args = parser.parse_args()
+    if args.skip_duplicates and not args.catalogue:
+        parser.error("--skip_duplicates requires --catalogue")
+
+    catalogue = LectureCatalogue(args.catalogue) if args.catalogue else None
 
     # Initialize and execute the downloader
-    downloader = NPTELDownloader(output_dir=args.output_dir, course_url=args.course_url)
+    downloader = NPTELDownloader(output_dir=args.output_dir, course_url=args.course_url,
+                                 catalogue=catalogue, course=args.course, skip_duplicates=args.skip_duplicates)
     downloader.setup_driver()
     downloader.fetch_video_links()
     downloader.download_videos()
+
+    if catalogue:
+        catalogue.close()
     
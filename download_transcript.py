@@ -6,6 +6,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
+from catalogue import LectureCatalogue, course_key_from_url, file_checksum
 
 
 class NPTELTranscriptsDownloader:
@@ -13,16 +14,20 @@ class NPTELTranscriptsDownloader:
     Class for downloading transcript files from NPTEL course pages.
     """
 
-    def __init__(self, output_dir, course_url):
+    def __init__(self, output_dir, course_url, catalogue=None, course=None):
         """
         Initialize the downloader with the output directory and course URL.
 
         Args:
             output_dir (str): Directory where transcripts will be saved.
             course_url (str): URL of the NPTEL course.
+            catalogue (LectureCatalogue): Optional catalogue to record downloads in.
+            course (str): Course key used in the catalogue; derived from the URL if not given.
         """
         self.output_dir = output_dir
         self.course_url = course_url
+        self.catalogue = catalogue
+        self.course = course or course_key_from_url(course_url)
         self.driver = None
         self.transcripts_links = []
 
@@ -105,7 +110,7 @@ class NPTELTranscriptsDownloader:
             idx (int): Index to uniquely identify the file.
 
         Returns:
-            Saves the file in the specified folder.
+            str: Path of the saved file, or None if the download failed.
         """
         try:
             if "drive.google.com" in link:
@@ -119,12 +124,14 @@ class NPTELTranscriptsDownloader:
                             for chunk in response.iter_content(chunk_size=8192):
                                 file.write(chunk)
                         print(f"Downloaded: {output_path}")
+                        return output_path
                     else:
                         print(f"Failed to download {link}: HTTP {response.status_code}")
             else:
                 print(f"Invalid Google Drive link: {link}")
         except Exception as e:
             print(f"Error downloading {link}: {e}")
+        return None
 
     def download_transcripts(self):
         """
@@ -141,7 +148,25 @@ class NPTELTranscriptsDownloader:
 
         print("Downloading the transcript files, this may take a while...")
         for idx, link in enumerate(self.transcripts_links):
-            self.download_file(link, self.output_dir, file_prefix="transcript", idx=idx)
+            output_path = self.download_file(link, self.output_dir, file_prefix="transcript", idx=idx)
+            if self.catalogue:
+                self.record_download(idx, link, output_path)
+
+    def record_download(self, idx, link, output_path):
+        """
+        Record a downloaded transcript and its stage status in the catalogue.
+
+        Args:
+            idx (int): Lecture index within the course.
+            link (str): URL the transcript was downloaded from.
+            output_path (str): Path of the saved PDF, or None if the download failed.
+        """
+        if output_path:
+            self.catalogue.upsert_lecture(self.course, idx, transcript_url=link, transcript_pdf_path=output_path,
+                                          transcript_checksum=file_checksum(output_path))
+        else:
+            self.catalogue.upsert_lecture(self.course, idx, transcript_url=link)
+        self.catalogue.set_stage_status(self.course, idx, "download_transcript", "done" if output_path else "failed")
 
 
 if __name__ == "__main__":
@@ -150,11 +175,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NPTEL Transcripts Downloader")
     parser.add_argument("-o", "--output_dir", required=True, help="Directory to save transcript files")
     parser.add_argument("-i", "--course_url", required=True, help="NPTEL course URL")
+    parser.add_argument("-db", "--catalogue", default=None, help="Optional SQLite lecture catalogue to record downloads in")
+    parser.add_argument("-c", "--course", default=None, help="Course key for the catalogue (defaults to the last segment of the course URL)")
     args = parser.parse_args()
 
+    catalogue = LectureCatalogue(args.catalogue) if args.catalogue else None
+
     # Create the downloader instance and start the download process
-    downloader = NPTELTranscriptsDownloader(output_dir=args.output_dir, course_url=args.course_url)
+    downloader = NPTELTranscriptsDownloader(output_dir=args.output_dir, course_url=args.course_url,
+                                            catalogue=catalogue, course=args.course)
     downloader.setup_driver()
     downloader.fetch_transcripts_links()
     downloader.download_transcripts()
 
+    if catalogue:
+        catalogue.close()
+
@@ -7,6 +7,7 @@ import string
 from PyPDF2 import PdfReader
 from num2words import num2words
 import argparse
+from catalogue import LectureCatalogue, lecture_index_from_filename
 
 def extract_text_from_pdf(pdf_path):
     """
@@ -67,51 +68,94 @@ def save_text_to_file(text, output_path):
         text (str): Cleaned text to save.
         output_path (str): Path to the output .txt file.
 
+    Returns:
+        bool: True if the text was saved successfully.
     """
     try:
         with open(output_path, "w", encoding="utf-8") as file:
             file.write(text)
         print(f"Text successfully saved to {output_path}")
+        return True
     except Exception as e:
         print(f"Error saving text to file {output_path}: {e}")
+        return False
 
-def process_pdfs(input_folder, output_folder):
+def process_pdfs(input_folder, output_folder, catalogue=None, course=None):
     """
     Processes all PDF files in the input folder by extracting, cleaning, 
     and saving their text to the output folder.
 
+    When a catalogue is given, the PDFs recorded for the course are processed
+    instead of scanning the input folder, the cleaned text is saved under a
+    subfolder named after the course, and its path is recorded back.
+
     Args:
         input_folder (str): Path to the folder containing PDF files.
         output_folder (str): Path to the folder for saving cleaned text files.
+        catalogue (LectureCatalogue): Optional catalogue to read PDFs from and record text in.
+        course (str): Course key used in the catalogue.
 
     """
+    # Keep courses apart, since every course numbers its lectures from 0
+    if catalogue:
+        output_folder = os.path.join(output_folder, course)
+
     # Create the output folder if it doesn't exist
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
     
-    # Iterate over all files in the input folder
-    for filename in os.listdir(input_folder):
-        if filename.endswith(".pdf"):  # Process only PDF files
-            pdf_path = os.path.join(input_folder, filename)
-            output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".txt")
-            
-            print(f"Processing {filename}...")
-            # Extract raw text from the PDF
-            raw_text = extract_text_from_pdf(pdf_path)
-            # Clean the extracted text
-            cleaned_text = clean_text(raw_text)
-            # Save the cleaned text to a .txt file
-            save_text_to_file(cleaned_text, output_path)
+    # Collect (lecture index, PDF path) pairs from the catalogue or the input folder
+    if catalogue:
+        pdfs = [(lecture["lecture_idx"], lecture["transcript_pdf_path"])
+                for lecture in catalogue.lectures(course, require=("transcript_pdf_path",))]
+    else:
+        pdfs = [(lecture_index_from_filename(filename), os.path.join(input_folder, filename))
+                for filename in os.listdir(input_folder) if filename.endswith(".pdf")]  # Process only PDF files
+
+    for lecture_idx, pdf_path in pdfs:
+        filename = os.path.basename(pdf_path)
+        output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".txt")
+        
+        print(f"Processing {filename}...")
+        # Extract raw text from the PDF
+        raw_text = extract_text_from_pdf(pdf_path)
+        # Clean the extracted text
+        cleaned_text = clean_text(raw_text)
+        # Save the cleaned text to a .txt file
+        saved = save_text_to_file(cleaned_text, output_path)
+
+        if catalogue:
+            # Empty text (unreadable or image-only PDF) must not pair with the audio
+            if not cleaned_text:
+                print(f"Warning: No text extracted from {filename}")
+                saved = False
+            if saved:
+                catalogue.upsert_lecture(course, lecture_idx, transcript_txt_path=output_path,
+                                         text_length=len(cleaned_text))
+            else:
+                catalogue.upsert_lecture(course, lecture_idx, transcript_txt_path=None, text_length=None)
+            catalogue.set_stage_status(course, lecture_idx, "preprocess_transcript", "done" if saved else "failed")
 
 if __name__ == "__main__":
     
     # Set up command-line argument parsing
     parser = argparse.ArgumentParser(description="Extract text from PDF files, clean the text, and save it to .txt files in the specified output folder.")
-    parser.add_argument("-inp", "--input_folder", required=True, help="Path to the folder containing input PDF files.")
+    parser.add_argument("-inp", "--input_folder", default=None, help="Path to the folder containing input PDF files (not needed with --catalogue).")
     parser.add_argument("-op", "--output_folder", required=True, help="Path to the folder where cleaned text files will be saved.")
+    parser.add_argument("-db", "--catalogue", default=None, help="Optional SQLite lecture catalogue to read PDFs from and record cleaned text in.")
+    parser.add_argument("-c", "--course", default=None, help="Course key for the catalogue (required with --catalogue).")
 
     args = parser.parse_args()
+    if args.catalogue and not args.course:
+        parser.error("--course is required when --catalogue is given")
+    if not args.catalogue and not args.input_folder:
+        parser.error("--input_folder is required without --catalogue")
+
+    catalogue = LectureCatalogue(args.catalogue) if args.catalogue else None
     
     # Process the PDFs
-    process_pdfs(args.input_folder, args.output_folder)
+    process_pdfs(args.input_folder, args.output_folder, catalogue=catalogue, course=args.course)
+
+    if catalogue:
+        catalogue.close()
 
@@ -0,0 +1,137 @@
+import os
+import json
+import pytest
+
+from catalogue import LectureCatalogue, course_key_from_url, lecture_index_from_filename
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    with LectureCatalogue(str(tmp_path / "catalogue.db")) as catalogue:
+        yield catalogue
+
+
+def test_course_key_from_url():
+    assert course_key_from_url("https://nptel.ac.in/courses/106106184") == "106106184"
+    assert course_key_from_url("https://nptel.ac.in/courses/106106184/") == "106106184"
+    assert course_key_from_url("https://nptel.ac.in/courses/106106184?tab=1") == "106106184"
+
+
+def test_lecture_index_from_filename():
+    assert lecture_index_from_filename("audio_3.wav") == 3
+    assert lecture_index_from_filename("/data/course/transcript_12.txt") == 12
+    assert lecture_index_from_filename("notes.txt") is None
+
+
+def test_upsert_lecture_updates_only_given_fields(catalogue):
+    catalogue.upsert_lecture("A", 0, audio_url="https://example.com/0", audio_path="audio_0.mp3")
+    catalogue.upsert_lecture("A", 0, wav_path="audio_0.wav", duration=12.5)
+
+    lecture = catalogue.get_lecture("A", 0)
+    assert lecture["audio_url"] == "https://example.com/0"
+    assert lecture["audio_path"] == "audio_0.mp3"
+    assert lecture["wav_path"] == "audio_0.wav"
+    assert lecture["duration"] == 12.5
+    assert catalogue.get_lecture("A", 1) is None
+
+    with pytest.raises(ValueError):
+        catalogue.upsert_lecture("A", 0, unknown="value")
+
+
+def test_set_stage_status(catalogue):
+    catalogue.set_stage_status("A", 0, "crop_audio", "failed")
+    catalogue.set_stage_status("A", 0, "crop_audio", "done")
+    catalogue.set_stage_status("A", 1, "crop_audio", "done")
+    catalogue.set_stage_status("B", 0, "manifest", "skipped")
+
+    assert catalogue.get_lecture("A", 1) is not None
+    assert catalogue.stage_counts() == {("crop_audio", "done"): 2, ("manifest", "skipped"): 1}
+    assert catalogue.stage_counts("B") == {("manifest", "skipped"): 1}
+
+    with pytest.raises(ValueError):
+        catalogue.set_stage_status("A", 0, "unknown", "done")
+
+
+def test_pairing_and_summary(catalogue):
+    catalogue.upsert_lecture("A", 0, wav_path="a0.wav", duration=1800.0,
+                             transcript_txt_path="a0.txt", text_length=100)
+    catalogue.upsert_lecture("A", 1, wav_path="a1.wav", duration=900.0)
+    catalogue.upsert_lecture("B", 0, wav_path="b0.wav", duration=3600.0,
+                             transcript_txt_path="b0.txt", text_length=50)
+    catalogue.upsert_lecture("B", 1, transcript_txt_path="b1.txt", text_length=70)
+
+    paired = catalogue.lectures(require=("wav_path", "transcript_txt_path"))
+    assert [(lecture["course"], lecture["lecture_idx"]) for lecture in paired] == [("A", 0), ("B", 0)]
+    assert [lecture["lecture_idx"] for lecture in catalogue.lectures("A")] == [0, 1]
+    assert catalogue.find_by_wav_path("b0.wav")["course"] == "B"
+
+    assert catalogue.summary() == {
+        "Lectures": 4,
+        "Paired Lectures": 2,
+        "Total Hours": 1.5,
+        "Total Characters": 150,
+    }
+    assert catalogue.summary("A")["Paired Lectures"] == 1
+
+    with pytest.raises(ValueError):
+        catalogue.lectures(require=("unknown",))
+
+
+def test_preprocess_records_text_and_fails_empty_transcripts(catalogue, tmp_path, monkeypatch):
+    preprocess_transcript = pytest.importorskip("preprocess_transcript")
+    texts = {"transcript_0.pdf": "Lecture 1, on sorting.", "transcript_1.pdf": ""}
+    monkeypatch.setattr(preprocess_transcript, "extract_text_from_pdf",
+                        lambda pdf_path: texts[os.path.basename(pdf_path)])
+
+    for course in ("A", "B"):
+        for idx in (0, 1):
+            catalogue.upsert_lecture(course, idx, transcript_pdf_path=f"{course}/transcript_{idx}.pdf",
+                                     wav_path=f"{course}_{idx}.wav", duration=60.0)
+    output_folder = tmp_path / "text"
+    for course in ("A", "B"):
+        preprocess_transcript.process_pdfs(None, str(output_folder), catalogue=catalogue, course=course)
+
+    # Courses write to separate subfolders instead of overwriting each other
+    for course in ("A", "B"):
+        lecture = catalogue.get_lecture(course, 0)
+        assert lecture["transcript_txt_path"] == str(output_folder / course / "transcript_0.txt")
+        assert lecture["text_length"] == len("lecture one on sorting")
+
+    # An empty transcript is not paired with its audio
+    assert catalogue.get_lecture("A", 1)["transcript_txt_path"] is None
+    assert catalogue.stage_counts("A") == {("preprocess_transcript", "done"): 1,
+                                           ("preprocess_transcript", "failed"): 1}
+    assert catalogue.summary()["Paired Lectures"] == 2
+
+
+def test_manifest_from_catalogue_writes_paired_lectures(catalogue, tmp_path):
+    create_manifest = pytest.importorskip("create_manifest")
+    transcript_path = tmp_path / "transcript_0.txt"
+    transcript_path.write_text("lecture one\n", encoding="utf-8")
+    catalogue.upsert_lecture("A", 0, wav_path="A/audio_0.wav", duration=42.0,
+                             transcript_txt_path=str(transcript_path))
+    catalogue.upsert_lecture("A", 1, wav_path="A/audio_1.wav", duration=30.0)
+
+    manifest_path = tmp_path / "manifest.jsonl"
+    create_manifest.generate_manifest_from_catalogue(catalogue, str(manifest_path))
+
+    entries = [json.loads(line) for line in manifest_path.read_text(encoding="utf-8").splitlines()]
+    assert entries == [{"audio_filepath": "A/audio_0.wav", "duration": 42.0, "text": "lecture one"}]
+    assert catalogue.stage_counts() == {("manifest", "done"): 1}
+
+
+def test_dashboard_falls_back_to_file_name(catalogue, tmp_path):
+    dashboard_preprocess = pytest.importorskip("dashboard_preprocess")
+    pandas = pytest.importorskip("pandas")
+    catalogue.upsert_lecture("A", 4, wav_path="crop/A/audio_4.wav")
+
+    manifest_path = tmp_path / "manifest.jsonl"
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        for path, duration in (("crop/A/audio_4.wav", 60.0), ("other/audio_7.wav", 120.0)):
+            manifest_file.write(json.dumps({"audio_filepath": path, "duration": duration, "text": "a b"}) + "\n")
+
+    dashboard_preprocess.process_jsonl(str(manifest_path), str(tmp_path / "out"), catalogue=catalogue)
+
+    detailed = pandas.read_csv(tmp_path / "out" / "detailed_data.csv")
+    assert detailed["audio_id"].tolist() == [4, 7]
+    assert detailed["course"].fillna("").tolist() == ["A", ""]
@@ -0,0 +1,152 @@
+import random
+import wave
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from catalogue import LectureCatalogue
+from dedup import DedupIndex
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    with LectureCatalogue(str(tmp_path / "catalogue.db")) as catalogue:
+        yield catalogue
+
+
+def lecture_text(seed, n_words=300):
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randrange(500)}" for _ in range(n_words))
+
+
+def test_empty_and_short_transcripts_are_skipped(catalogue):
+    index = DedupIndex(catalogue)
+    assert index.index_text("A", 0, "") is None
+    assert index.index_text("A", 1, "") is None
+    assert index.index_text("B", 3, "   ") is None
+    assert index.index_text("B", 4, "hello") is None
+    assert index.index_text("B", 5, "hello") is None
+    assert index.duplicate_of("B", 5) is None
+    assert catalogue.stage_counts() == {("dedup", "skipped"): 5}
+
+
+def test_text_duplicate_is_flagged(catalogue):
+    index = DedupIndex(catalogue)
+    text = lecture_text(1)
+    assert index.index_text("A", 0, text) is None
+    assert index.index_text("B", 0, lecture_text(2)) is None
+    match = index.index_text("C", 4, text)
+    assert match[:2] == ("A", 0)
+
+
+def test_duplicate_of_requires_available_original(catalogue):
+    index = DedupIndex(catalogue)
+    text = lecture_text(3)
+    catalogue.upsert_lecture("A", 0, transcript_txt_path="transcript_0.txt")
+    index.index_text("A", 0, text)
+    index.index_text("B", 5, text)
+
+    assert index.duplicate_of("B", 5)["duplicate_course"] == "A"
+    assert index.duplicate_of("B", 5, require=("audio_path",)) is None
+
+    catalogue.upsert_lecture("A", 0, audio_path="audio_0.mp3")
+    assert index.duplicate_of("B", 5, require=("audio_path",))["duplicate_lecture_idx"] == 0
+
+
+def test_manifest_keeps_duplicate_when_original_fails(catalogue, tmp_path):
+    create_manifest = pytest.importorskip("create_manifest")
+    index = DedupIndex(catalogue)
+    text = lecture_text(4)
+    for course in ("A", "B"):
+        transcript_path = tmp_path / f"{course}.txt"
+        transcript_path.write_text(text, encoding="utf-8")
+        catalogue.upsert_lecture(course, 0, wav_path=str(tmp_path / f"{course}.wav"),
+                                 transcript_txt_path=str(transcript_path), duration=60.0)
+        index.index_text(course, 0, text)
+
+    # The original's transcript disappears, so its entry fails and the duplicate stands in
+    (tmp_path / "A.txt").unlink()
+    manifest_path = tmp_path / "manifest.jsonl"
+    create_manifest.generate_manifest_from_catalogue(catalogue, str(manifest_path), skip_duplicates=True)
+
+    lines = manifest_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert str(tmp_path / "B.wav") in lines[0]
+
+
+def write_wav(path, samples, framerate=16000):
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(np.clip(samples, -32768, 32767).astype("<i2").tobytes())
+
+
+def speech_like(rng, seconds, framerate=16000):
+    # White noise under a 50 ms random envelope, roughly like syllables
+    n_samples = framerate * seconds
+    envelope = np.repeat(np.abs(rng.randn(n_samples // 800 + 1)), 800)[:n_samples]
+    return rng.randn(n_samples) * envelope * 3000
+
+
+def test_offset_noisy_audio_copy_is_flagged(catalogue, tmp_path):
+    rng = np.random.RandomState(0)
+    original = speech_like(rng, 60)
+    noise = rng.randn(len(original)) * 3000 * 10 ** (-30 / 20)
+    copy = (original + noise)[160:]  # 10 ms later, 30 dB SNR
+    write_wav(tmp_path / "original.wav", original)
+    write_wav(tmp_path / "copy.wav", copy)
+    write_wav(tmp_path / "other.wav", speech_like(rng, 60))
+    write_wav(tmp_path / "silence.wav", np.zeros(16000 * 60))
+
+    index = DedupIndex(catalogue)
+    for course, name in (("A", "original"), ("B", "other"), ("C", "copy"), ("D", "silence")):
+        catalogue.upsert_lecture(course, 0, wav_path=str(tmp_path / f"{name}.wav"))
+
+    assert index.index_audio("A", 0, str(tmp_path / "original.wav")) is None
+    assert index.index_audio("B", 0, str(tmp_path / "other.wav")) is None
+
+    # Matches are verified against the stored fingerprint, not the original WAV
+    (tmp_path / "original.wav").unlink()
+    match = index.index_audio("C", 0, str(tmp_path / "copy.wav"))
+    assert match[:2] == ("A", 0)
+    assert match[2] >= 0.8
+    assert index.index_audio("D", 0, str(tmp_path / "silence.wav")) is None
+    assert index.duplicate_of("D", 0) is None
+
+
+def test_long_lecture_is_not_flagged_against_short_excerpt(catalogue, tmp_path):
+    rng = np.random.RandomState(1)
+    lecture = speech_like(rng, 300)
+    write_wav(tmp_path / "excerpt.wav", lecture[16000 * 60:16000 * 90])
+    write_wav(tmp_path / "lecture.wav", lecture)
+
+    index = DedupIndex(catalogue)
+    catalogue.upsert_lecture("A", 0, wav_path=str(tmp_path / "excerpt.wav"))
+    catalogue.upsert_lecture("B", 0, wav_path=str(tmp_path / "lecture.wav"))
+
+    assert index.index_audio("A", 0, str(tmp_path / "excerpt.wav")) is None
+    assert index.index_audio("B", 0, str(tmp_path / "lecture.wav")) is None
+
+
+def test_manifest_for_one_course_keeps_duplicate_of_other_course(catalogue, tmp_path):
+    create_manifest = pytest.importorskip("create_manifest")
+    index = DedupIndex(catalogue)
+    text = lecture_text(5)
+    for course in ("A", "B"):
+        transcript_path = tmp_path / f"{course}.txt"
+        transcript_path.write_text(text, encoding="utf-8")
+        catalogue.upsert_lecture(course, 0, wav_path=str(tmp_path / f"{course}.wav"),
+                                 transcript_txt_path=str(transcript_path), duration=60.0)
+        index.index_text(course, 0, text)
+
+    # An earlier run wrote course A to a different manifest
+    create_manifest.generate_manifest_from_catalogue(catalogue, str(tmp_path / "a.jsonl"), course="A",
+                                                     skip_duplicates=True)
+    manifest_path = tmp_path / "b.jsonl"
+    create_manifest.generate_manifest_from_catalogue(catalogue, str(manifest_path), course="B",
+                                                     skip_duplicates=True)
+
+    lines = manifest_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert str(tmp_path / "B.wav") in lines[0]